@@ -10,16 +10,105 @@ Improved version of the experiment runner with:
 
 import os
 import re
+import sys
 import json
+import decimal
+import logging
+import logging.handlers
 import time
-import glob
+import functools
+import importlib.util
+import queue
+import asyncio
+import contextlib
+import threading
+import concurrent.futures
 import requests
 import urllib3
+from collections import deque
 from datetime import datetime
-from pathlib import Path
+
+try:
+    import orjson  # Optional: faster JSON encoding/decoding
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # Optional: streams result files when only the summary is needed
+except ImportError:
+    ijson = None
+
+# Raised when a result file is not valid JSON (json and orjson errors are ValueErrors)
+_JSON_DECODE_ERRORS = (ValueError,) if ijson is None else (ValueError, ijson.JSONError)
+
+try:
+    import httpx  # Optional: only needed for run_all_async
+except ImportError:
+    httpx = None
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+logger = logging.getLogger(__name__)
+
+class BufferedConsoleHandler(logging.handlers.MemoryHandler):
+    """Buffer log records and write them to the console in batches
+    
+    The buffer is written out once `capacity` records are queued, when a
+    WARNING or worse is logged, and at least every `interval` seconds.
+    """
+    def __init__(self, capacity=50, interval=1.0, stream=None):
+        target = logging.StreamHandler(stream or sys.stdout)  # Same stream as the menu's print output
+        target.setFormatter(logging.Formatter("%(message)s"))
+        super().__init__(capacity, flushLevel=logging.WARNING, target=target, flushOnClose=True)
+        self.interval = interval
+        threading.Thread(target=self._flush_loop, daemon=True).start()
+    
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+# Generic plan line formats, compiled once at import time into one regex:
+#   (action param1 param2)        standard; nothing else may follow on the line
+#   0.000: (action) [duration]    temporal, also covers numbered "1: (action)"
+#   step 1: ACTION PARAM          step format
+# The action lands in the named group "act" (parenthesised forms) or "step".
+_GENERIC_PLAN_RE = re.compile(r'''
+    ^\s*(?:
+        (?P<num>[\d.]+:\s*)?\((?P<act>[^)]+)\)(?(num)|\s*$)
+      | step\s+\d+:\s*(?P<step>[A-Z\-]+(?:\s+[A-Z0-9\-]+)*)
+    )''', re.IGNORECASE | re.VERBOSE)
+_STEP_RE = re.compile(r'\bstep\s+\d+:', re.IGNORECASE)
+
+def _json_dumps(data, indent=False):
+    """Encode data as UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+def _json_loads(data):
+    """Decode JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _scan_result_summary(f):
+    """Stream a result file for its top-level 'solved' and 'plan_length' only
+    
+    Stops as soon as both are seen, so the plan list is never materialized.
+    Returns None when the document is not a JSON object.
+    """
+    summary = {}
+    for prefix, event, value in ijson.parse(f):
+        if prefix == '' and event not in ('start_map', 'map_key', 'end_map'):
+            return None
+        # Keep any scalar so the caller validates the same values as a full load
+        if prefix in ('solved', 'plan_length') and event in ('null', 'boolean', 'number', 'string'):
+            summary[prefix] = value
+            if len(summary) == 2:
+                break
+    return summary
+
 class ImprovedExperimentRunner:
     def __init__(self):
         self.base_url = "https://solver.planning.domains:5001"
@@ -29,16 +118,36 @@ class ImprovedExperimentRunner:
         self.debug_dir = "rerun_results_extended_timeout"
         
         # Create directories if they don't exist
-        Path(self.results_dir).mkdir(exist_ok=True)
-        Path(self.debug_dir).mkdir(exist_ok=True)
+        os.makedirs(self.results_dir, exist_ok=True)
+        os.makedirs(self.debug_dir, exist_ok=True)
+        
+        # Index existing result files once instead of stat-ing each candidate,
+        # and memoize check_existing_result per (domain, planner, problem)
+        self._existing_files = set()
+        self._existing_cache = {}
+        self.refresh_existing_index()
         
         # The 4 planners you're testing
         self.planners = ["lama-first", "dual-bfws-ffparser", "delfi", "optic"]
         
+        # Persistent HTTP session so requests and polls reuse kept-alive TLS
+        # connections. Everything goes to one host, so a single pool is sized
+        # for the concurrent runners (run_all workers) rather than per host.
+        self.session = requests.Session()
+        self.session.verify = False
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=32, max_retries=3)
+        self.session.mount("https://", adapter)
+        
+        # Adaptive polling: back off while nothing changes, reset on new output.
+        # The first seconds always poll fast so short solve times stay accurate.
+        self.poll_interval_min = 0.5
+        self.poll_interval_max = 5.0
+        self.poll_fast_window = 30.0
+        
 
         # BLACKLIST: Skip experiments that are proven to fail
 
-        self.blacklist = [
+        self.blacklist_list = [
             # BARMAN DOMAIN (16 failures total)
             
             # LAMA-first (1 failure)
@@ -90,10 +199,21 @@ class ImprovedExperimentRunner:
             # - Optic: 9 failures (8 barman + 1 blocksworld)
             # - Delfi: 11 failures (8 barman + 3 blocksworld)
         ]
+        # Set for O(1) lookups; the list keeps the grouped order for display
+        self.blacklist = frozenset(self.blacklist_list)
 
         
         # Track last debug state to avoid duplicate saves
         self.last_debug_state = {}
+        self._debug_state_lock = threading.Lock()
+        
+        # Debug/failed/timeout dumps are written by a background thread so
+        # disk I/O never stalls the polling loop
+        self._write_q = queue.Queue()
+        threading.Thread(target=self._writer_loop, daemon=True).start()
+
+        # Incremental Delfi stdout parsing state, keyed by experiment
+        self._progress_state = {}
         
        # FOCUSED TIMEOUTS: Only for promising experiments
         self.extended_timeouts = {
@@ -172,6 +292,16 @@ class ImprovedExperimentRunner:
         }
    
         
+        # One alternation per planner over its timeout keys, longest first so a
+        # key is never shadowed by a shorter key it contains. A key must not be
+        # followed by another digit: "instance-1" is not a rule for "instance-15"
+        # and "LOGISTICS-1" is not one for "LOGISTICS-10".
+        self._timeout_re = {}
+        for planner, timeouts in self.extended_timeouts.items():
+            keys = sorted((k for k in timeouts if k != 'default'), key=len, reverse=True)
+            rx = re.compile('(?:' + '|'.join(re.escape(k) for k in keys) + r')(?!\d)') if keys else None
+            self._timeout_re[planner] = (rx, {k: timeouts[k] for k in keys}, timeouts.get('default', 1800))
+        
         self.domain_actions = {
             "blocksworld": ['pick-up', 'put-down', 'stack', 'unstack'],
             "barman": [
@@ -184,10 +314,40 @@ class ImprovedExperimentRunner:
                 'drive-truck', 'fly-airplane'
             ]
         }
-        
+
+        # Set views of the action lists for O(1) membership checks while parsing
+        self._domain_action_sets = {d: frozenset(acts) for d, acts in self.domain_actions.items()}
+
+        # Precompiled patterns for Delfi progress monitoring
+        self._re_init = re.compile(r"Done initializing merge-and-shrink heuristic \[(\d+\.\d+)s\]")
+        self._re_chose = re.compile(r"Chose ([^\n]+)")
+        self._re_eval = re.compile(r"\[g=(\d+), (\d+) evaluated, (\d+) expanded, t=([\d.]+)s")
+        self._re_f = re.compile(r"f = (\d+)")
+        self._re_h = re.compile(r"New best heuristic value[^:]+: (\d+)")
+
+        # Precompiled patterns for plan parsing
+        # One alternation per domain matches any action name followed by its parameters
+        self._action_alt = {
+            domain: re.compile(r'\b(' + '|'.join(map(re.escape, actions)) + r')\s+[^()\n]+', re.IGNORECASE)
+            for domain, actions in self.domain_actions.items()
+        }
+        # The parser is pure in (text, domain, planner); repeated polls often
+        # return the same output. Only each experiment's latest stdout is ever
+        # hit again, so keep roughly one entry per concurrent experiment
+        self._parse_plan_text = functools.lru_cache(maxsize=8)(self._parse_plan_text)
+
         self.domains = {}
+        self._domain_bytes = {}  # JSON-encoded domain text, reused in every request body
+        self._problem_cache = {}  # Problem file contents by path, shared across planners
         self._load_domains()
         self._discover_problems()
+        
+        # Resolve the timeout rules once for every known (planner, problem)
+        self._timeout_cache = {
+            (planner, problem): self._compute_timeout(planner, problem)
+            for _, problem, _ in self.all_problems
+            for planner in self.planners
+        }
     
     def _load_domains(self):
         """Load domain files with correct names"""
@@ -202,106 +362,200 @@ class ImprovedExperimentRunner:
                 try:
                     with open(path, 'r') as f:
                         self.domains[domain_name] = f.read()
-                    print(f"✓ Loaded {domain_name} domain from {path}")
+                    self._domain_bytes[domain_name] = _json_dumps(self.domains[domain_name])
+                    logger.info(f"✓ Loaded {domain_name} domain from {path}")
                 except Exception as e:
-                    print(f"✗ Failed to load {domain_name} from {path}: {e}")
+                    logger.warning(f"✗ Failed to load {domain_name} from {path}: {e}")
             else:
-                print(f"✗ {domain_name} domain file not found at: {path}")
+                logger.warning(f"✗ {domain_name} domain file not found at: {path}")
     
     def _discover_problems(self):
         """Discover all problem files for each domain"""
         self.all_problems = []
+        self._stems = {}  # Problem filename -> name without .pddl, for output filenames
         
+        # (directory, filename prefix, filename suffix) per domain
         problem_patterns = {
-            "blocksworld": ("blocksworld_files", "problema_*.pddl"),
-            "barman": ("barman_files", "instance-*.pddl"),
-            "logistics": ("logistics_files", "probLOGISTICS-*.pddl")
+            "blocksworld": ("blocksworld_files", "problema_", ".pddl"),
+            "barman": ("barman_files", "instance-", ".pddl"),
+            "logistics": ("logistics_files", "probLOGISTICS-", ".pddl")
         }
         
-        for domain, (directory, pattern) in problem_patterns.items():
+        for domain, (directory, prefix, suffix) in problem_patterns.items():
             if os.path.exists(directory):
-                problem_files = sorted(glob.glob(os.path.join(directory, pattern)))
-                for problem_path in problem_files:
-                    problem_name = os.path.basename(problem_path)
+                # One directory read; DirEntry caches the file type, so no per-file stat
+                with os.scandir(directory) as entries:
+                    problem_files = sorted(entry.name for entry in entries
+                                           if entry.name.startswith(prefix) and entry.name.endswith(suffix)
+                                           and entry.is_file())
+                for problem_name in problem_files:
+                    self._stems[problem_name] = problem_name[:-len(suffix)]
                     self.all_problems.append((domain, problem_name, directory))
-                print(f"Found {len(problem_files)} problems for {domain}")
+                logger.info(f"Found {len(problem_files)} problems for {domain}")
         
-        print(f"Total problems discovered: {len(self.all_problems)}")
+        logger.info(f"Total problems discovered: {len(self.all_problems)}")
+    
+    def _load_problem(self, path):
+        """Read a problem file, caching its content for the other planners
+        
+        Raises FileNotFoundError on a cache miss for a missing file; cached
+        problems are served without touching the filesystem.
+        """
+        if path not in self._problem_cache:
+            with open(path, 'r') as f:
+                self._problem_cache[path] = f.read()
+        return self._problem_cache[path]
     
     def is_blacklisted(self, planner, domain, problem):
         """Check if an experiment is in the blacklist"""
         return (planner, domain, problem) in self.blacklist
     
+    def refresh_existing_index(self):
+        """Rescan the results directory in one pass, keeping confirmed results"""
+        with os.scandir(self.results_dir) as entries:
+            self._existing_files = {entry.name for entry in entries if entry.name.endswith(".json")}
+        # Negative answers may be stale now; confirmed ones stay valid while the file exists
+        self._existing_cache = {
+            key: answer for key, answer in self._existing_cache.items()
+            if answer[0] and self._result_filename(*key) in self._existing_files
+        }
+    
+    def _stem(self, problem):
+        """Problem filename without .pddl, precomputed for discovered problems"""
+        stem = self._stems.get(problem)
+        return stem if stem is not None else problem.replace('.pddl', '')
+    
+    def _result_filename(self, domain, planner, problem):
+        """Name of the successful-result file for an experiment"""
+        return f"{domain}_{planner}_{self._stem(problem)}.json"
+    
     def check_existing_result(self, domain, planner, problem):
-        """Check if a successful result already exists"""
-        existing_pattern = f"{domain}_{planner}_{problem.replace('.pddl', '')}.json"
-        existing_path = os.path.join(self.results_dir, existing_pattern)
+        """Check if a successful result already exists (memoized per experiment)
         
-        if os.path.exists(existing_path):
+        Returns (exists, summary), where summary holds only 'solved' and 'plan_length'.
+        """
+        key = (domain, planner, problem)
+        answer = self._existing_cache.get(key)
+        if answer is None:
+            answer = self._existing_cache[key] = self._read_existing_result(domain, planner, problem)
+        return answer
+    
+    def _read_existing_result(self, domain, planner, problem):
+        """Load and validate a result file if the directory index has one"""
+        existing_pattern = self._result_filename(domain, planner, problem)
+        if existing_pattern in self._existing_files:
+            existing_path = os.path.join(self.results_dir, existing_pattern)
             try:
-                with open(existing_path, 'r') as f:
-                    data = json.load(f)
-                if data.get('solved', False) and data.get('plan_length', 0) > 0:
-                    return True, data
-            except:
-                pass
+                with open(existing_path, 'rb') as f:
+                    # Only the summary fields are needed; stream them when ijson is available.
+                    # The stream stops early, so a file truncated after plan_length still
+                    # passes here; only the full load notices that kind of damage.
+                    data = _scan_result_summary(f) if ijson is not None else _json_loads(f.read())
+            except OSError as e:
+                logger.warning(f"✗ Could not read {existing_path}: {e}")
+                return False, None
+            except _JSON_DECODE_ERRORS as e:
+                self._set_aside_corrupt(existing_pattern, e)
+                return False, None
+            
+            # Valid JSON that cannot be compared below is as unusable as a decode error.
+            # Any number is fine (ijson yields Decimal for 3.0); a missing key means unsolved.
+            plan_length = data.get('plan_length', 0) if isinstance(data, dict) else None
+            if isinstance(plan_length, bool) or not isinstance(plan_length, (int, float, decimal.Decimal)):
+                self._set_aside_corrupt(existing_pattern, "not an object with a numeric plan_length")
+                return False, None
+            if data.get('solved', False) and plan_length > 0:
+                return True, {"solved": True, "plan_length": plan_length}
         
         return False, None
     
+    def _set_aside_corrupt(self, filename, reason):
+        """Rename a bad result file so it is reported once, not on every scan"""
+        existing_path = os.path.join(self.results_dir, filename)
+        logger.warning(f"✗ Corrupted result {existing_path}: {reason}")
+        # Timestamped like the debug dumps, so an earlier .corrupt file is never overwritten
+        try:
+            os.rename(existing_path, f"{existing_path}.{int(time.time())}.corrupt")
+        except OSError:
+            pass
+        self._existing_files.discard(filename)
+    
     def get_timeout(self, planner, problem):
         """Get appropriate timeout for the problem"""
-        timeouts = self.extended_timeouts.get(planner, {})
-        
-        # Check specific problem patterns
-        for key in timeouts:
-            if key in problem:
-                return timeouts[key]
-        
-        # Return default timeout
-        return timeouts.get('default', 1800)
-    
-    def monitor_delfi_progress(self, stdout_text):
-        """Extract Delfi progress information"""
-        progress_info = {}
-        
-        # Check initialization phases
-        if "Done initializing merge-and-shrink heuristic" in stdout_text:
-            match = re.search(r"Done initializing merge-and-shrink heuristic \[(\d+\.\d+)s\]", stdout_text)
-            if match:
-                progress_info['initialization_time'] = float(match.group(1))
-        
-        # Check which planner Delfi selected
-        if "Chose" in stdout_text:
-            match = re.search(r"Chose ([^\n]+)", stdout_text)
-            if match:
-                progress_info['selected_config'] = match.group(1).strip()
-        
-        # Check search progress
-        if "evaluated" in stdout_text:
-            matches = re.findall(r"\[g=(\d+), (\d+) evaluated, (\d+) expanded, t=([\d.]+)s", stdout_text)
-            if matches:
-                last_match = matches[-1]
-                progress_info['g_value'] = int(last_match[0])
-                progress_info['evaluated'] = int(last_match[1])
-                progress_info['expanded'] = int(last_match[2])
-                progress_info['search_time'] = float(last_match[3])
-        
-        # Check f-value progression
-        f_values = re.findall(r"f = (\d+)", stdout_text)
-        if f_values:
-            progress_info['current_f'] = int(f_values[-1])
-            progress_info['f_progression'] = [int(f) for f in f_values]
-        
-        # Check heuristic value improvements
-        h_improvements = re.findall(r"New best heuristic value[^:]+: (\d+)", stdout_text)
-        if h_improvements:
-            progress_info['h_progression'] = [int(h) for h in h_improvements]
+        timeout = self._timeout_cache.get((planner, problem))
+        if timeout is None:
+            timeout = self._compute_timeout(planner, problem)
+        return timeout
+    
+    def _compute_timeout(self, planner, problem):
+        """Evaluate the extended timeout rules for a problem"""
+        rule = self._timeout_re.get(planner)
+        if rule is None:
+            return 1800
         
-        # Check for timeout/signal
-        if "caught signal" in stdout_text:
-            progress_info['terminated'] = "signal"
-        elif "timeout" in stdout_text.lower():
-            progress_info['terminated'] = "timeout"
+        # Single pass over the name; longer keys are tried first at each position
+        rx, table, default = rule
+        match = rx.search(problem) if rx else None
+        return table[match.group(0)] if match else default
+    
+    def monitor_delfi_progress(self, stdout_text, key, final=False):
+        """Extract Delfi progress information
+
+        Progress is parsed incrementally: only the complete lines appended to
+        stdout since the previous call for the same experiment key are scanned.
+        Pass final=True once stdout is complete so a last line without a
+        trailing newline is parsed too. The returned dict is the live
+        per-experiment state; copy it to keep a snapshot.
+        """
+        state = self._progress_state.get(key)
+        if state is None or len(stdout_text) < state['cursor']:
+            # First poll for this experiment (or the output was reset)
+            state = self._progress_state[key] = {'cursor': 0, 'partial': '', 'info': {}}
+        progress_info = state['info']
+        
+        # Only complete lines are parsed; a trailing partial line waits for the next poll
+        lines = (state['partial'] + stdout_text[state['cursor']:]).split('\n')
+        state['cursor'] = len(stdout_text)
+        state['partial'] = '' if final else lines.pop()
+        
+        for line in lines:
+            # Check initialization phases
+            if 'initialization_time' not in progress_info and "Done initializing merge-and-shrink heuristic" in line:
+                match = self._re_init.search(line)
+                if match:
+                    progress_info['initialization_time'] = float(match.group(1))
+            
+            # Check which planner Delfi selected
+            if 'selected_config' not in progress_info and "Chose" in line:
+                match = self._re_chose.search(line)
+                if match:
+                    progress_info['selected_config'] = match.group(1).strip()
+            
+            # Check search progress
+            if "evaluated" in line:
+                for match in self._re_eval.finditer(line):
+                    progress_info['g_value'] = int(match.group(1))
+                    progress_info['evaluated'] = int(match.group(2))
+                    progress_info['expanded'] = int(match.group(3))
+                    progress_info['search_time'] = float(match.group(4))
+            
+            # Check f-value progression
+            if "f = " in line:
+                for match in self._re_f.finditer(line):
+                    f_value = int(match.group(1))
+                    progress_info.setdefault('f_progression', []).append(f_value)
+                    progress_info['current_f'] = f_value
+            
+            # Check heuristic value improvements
+            if "New best heuristic value" in line:
+                for match in self._re_h.finditer(line):
+                    progress_info.setdefault('h_progression', []).append(int(match.group(1)))
+            
+            # Check for timeout/signal
+            if "caught signal" in line:
+                progress_info['terminated'] = "signal"
+            elif 'terminated' not in progress_info and "timeout" in line.lower():
+                progress_info['terminated'] = "timeout"
         
         return progress_info
     
@@ -309,69 +563,137 @@ class ImprovedExperimentRunner:
         """Determine if debug info should be saved based on state changes"""
         key = f"{planner}_{domain}_{problem}"
         
-        # Always save first debug
-        if key not in self.last_debug_state:
-            self.last_debug_state[key] = progress_info
-            return True
+        with self._debug_state_lock:
+            # Always save first debug
+            if key not in self.last_debug_state:
+                self.last_debug_state[key] = dict(progress_info)
+                return True
+            
+            last_state = self.last_debug_state[key]
+            
+            # For Delfi, check if meaningful progress has been made
+            if planner == "delfi":
+                # Save if evaluated states changed significantly (more than 1000)
+                if progress_info.get('evaluated', 0) - last_state.get('evaluated', 0) > 1000:
+                    self.last_debug_state[key] = dict(progress_info)
+                    return True
+            
+                # Save if f-value changed
+                if progress_info.get('current_f') != last_state.get('current_f'):
+                    self.last_debug_state[key] = dict(progress_info)
+                    return True
+            
+            # For other planners, save every 5 minutes
+            return False
+    
+    def run_experiment_with_extended_timeout(self, planner, problem, domain, problem_dir, problem_content=None):
+        """Run experiment with reduced debug saving
         
-        last_state = self.last_debug_state[key]
+        problem_content, when given, is used instead of reading the problem file.
+        """
+        skip_result, exp = self._prepare_experiment(planner, problem, domain, problem_dir, problem_content)
+        if skip_result is not None:
+            return skip_result
         
-        # For Delfi, check if meaningful progress has been made
-        if planner == "delfi":
-            # Save if evaluated states changed significantly (more than 1000)
-            if progress_info.get('evaluated', 0) - last_state.get('evaluated', 0) > 1000:
-                self.last_debug_state[key] = progress_info
-                return True
+        exp['start'] = time.time()
+        try:
+            logger.info("→ Sending request to planner...")
+            response = self.session.post(exp['url'], data=exp['payload'], headers={"Content-Type": "application/json"}, timeout=60)
+            failed = self._start_polling(exp, response)
+            if failed is not None:
+                return failed
             
-            # Save if f-value changed
-            if progress_info.get('current_f') != last_state.get('current_f'):
-                self.last_debug_state[key] = progress_info
-                return True
+            while time.time() - exp['start'] < exp['timeout']:
+                try:
+                    final = self._handle_poll(exp, self.session.get(exp['result_url'], timeout=10))
+                    if final is not None:
+                        return final
+                except Exception as e:
+                    pass
+                
+                time.sleep(exp['poll_interval'])
+                self._back_off_polling(exp)
+            
+            return self._finish_timeout(exp)
+            
+        except Exception as e:
+            return self._finish_error(exp, e)
+    
+    async def run_experiment_async(self, planner, problem, domain, problem_dir, client, problem_content=None):
+        """Async variant of run_experiment_with_extended_timeout using an httpx.AsyncClient"""
+        skip_result, exp = self._prepare_experiment(planner, problem, domain, problem_dir, problem_content)
+        if skip_result is not None:
+            return skip_result
         
-        # For other planners, save every 5 minutes
-        return False
+        exp['start'] = time.time()
+        try:
+            logger.info("→ Sending request to planner...")
+            response = await client.post(exp['url'], content=exp['payload'], headers={"Content-Type": "application/json"}, timeout=60)
+            failed = self._start_polling(exp, response)
+            if failed is not None:
+                return failed
+            
+            while time.time() - exp['start'] < exp['timeout']:
+                try:
+                    final = self._handle_poll(exp, await client.get(exp['result_url'], timeout=10))
+                    if final is not None:
+                        return final
+                except Exception as e:
+                    pass
+                
+                await asyncio.sleep(exp['poll_interval'])
+                self._back_off_polling(exp)
+            
+            return self._finish_timeout(exp)
+            
+        except Exception as e:
+            return self._finish_error(exp, e)
     
-    def run_experiment_with_extended_timeout(self, planner, problem, domain, problem_dir):
-        """Run experiment with reduced debug saving"""
+    def _prepare_experiment(self, planner, problem, domain, problem_dir, problem_content=None):
+        """Run the pre-flight checks and build the request for one experiment
         
+        Returns (result, None) when the experiment should not be sent, and
+        (None, exp) otherwise, where exp holds the per-experiment poll state.
+        """
         # Check if blacklisted
         if self.is_blacklisted(planner, domain, problem):
-            print(f"⚠️  SKIPPED (blacklisted): {domain}/{problem} with {planner}")
-            return {"solved": False, "error": "Blacklisted", "skipped": True}
+            logger.info(f"⚠️  SKIPPED (blacklisted): {domain}/{problem} with {planner}")
+            return {"solved": False, "error": "Blacklisted", "skipped": True}, None
         
         # Check if already solved
         exists, existing_data = self.check_existing_result(domain, planner, problem)
         if exists:
-            print(f"✓ Already solved: {domain}/{problem} with {planner} (length: {existing_data['plan_length']})")
-            return existing_data
+            logger.info(f"✓ Already solved: {domain}/{problem} with {planner} (length: {existing_data['plan_length']})")
+            return existing_data, None
         
         # Get domain and problem content
         domain_content = self.domains.get(domain)
         if not domain_content:
-            print(f"✗ Domain not loaded for {domain}")
-            return {"solved": False, "error": "Domain not loaded"}
+            logger.warning(f"✗ Domain not loaded for {domain}")
+            return {"solved": False, "error": "Domain not loaded"}, None
         
-        problem_path = os.path.join(problem_dir, problem)
-        if not os.path.exists(problem_path):
-            print(f"✗ Problem file not found: {problem_path}")
-            return {"solved": False, "error": "Problem file not found"}
-            
-        with open(problem_path, 'r') as f:
-            problem_content = f.read()
+        if problem_content is None:
+            problem_path = os.path.join(problem_dir, problem)
+            try:
+                problem_content = self._load_problem(problem_path)
+            except FileNotFoundError:
+                logger.warning(f"✗ Problem file not found: {problem_path}")
+                return {"solved": False, "error": "Problem file not found"}, None
         
         timeout = self.get_timeout(planner, problem)
         
-        print(f"\n{'='*70}")
-        print(f"Running: {planner} on {domain}/{problem}")
-        print(f"Timeout: {timeout} seconds ({timeout/60:.1f} minutes)")
+        logger.info(f"\n{'='*70}")
+        logger.info(f"Running: {planner} on {domain}/{problem}")
+        logger.info(f"Timeout: {timeout} seconds ({timeout/60:.1f} minutes)")
         if planner == "delfi":
-            print("Note: Delfi includes ~25s preprocessing overhead")
-        print('='*70)
+            logger.info("Note: Delfi includes ~25s preprocessing overhead")
+        logger.info('='*70)
         
         # Map planner names to solver.planning.domains format if needed
         solver_planner = planner
         url = f"{self.base_url}/package/{solver_planner}/solve"
-        data = {"domain": domain_content, "problem": problem_content}
+        # Only the problem needs encoding; the domain was encoded once at load time
+        payload = b'{"domain":' + self._domain_bytes[domain] + b',"problem":' + _json_dumps(problem_content) + b'}'
         
         result_data = {
             "domain": domain,
@@ -388,142 +710,203 @@ class ImprovedExperimentRunner:
             "progress_info": {}
         }
         
-        try:
-            start = time.time()
-            print("→ Sending request to planner...", end='', flush=True)
-            response = requests.post(url, json=data, verify=False, timeout=60)
-            
-            if response.status_code != 200:
-                result_data["error"] = f"HTTP {response.status_code}"
-                result_data["time"] = time.time() - start
-                print(f" FAILED (HTTP {response.status_code})")
-                
-                # Save failed result to debug directory
-                self._save_failed_result(domain, planner, problem, result_data)
-                return result_data
-            
-            initial = response.json()
-            if 'result' not in initial:
-                result_data["error"] = "No result URL"
-                result_data["time"] = time.time() - start
-                print(" FAILED (No URL)")
-                
-                # Save failed result to debug directory
-                self._save_failed_result(domain, planner, problem, result_data)
-                return result_data
-            
-            result_url = self.base_url + initial['result']
-            print(" OK")
-            print(f"→ Polling for results (timeout: {timeout}s)...", end='', flush=True)
-            
-            # Poll with reduced debug saving
-            last_progress = time.time()
-            last_debug_save = time.time()
-            poll_responses = []
-            debug_save_count = 0
-            max_debug_saves = 5  # Limit total debug saves per experiment
-            
-            while time.time() - start < timeout:
-                try:
-                    resp = requests.get(result_url, verify=False, timeout=10)
-                    if resp.status_code == 200:
-                        resp_data = resp.json()
-                        
-                        # Store response for debugging
-                        poll_responses.append({
-                            "time_elapsed": time.time() - start,
-                            "status": resp_data.get('status'),
-                            "has_result": 'result' in resp_data
-                        })
-                        
-                        if 'status' in resp_data and resp_data['status'] == 'ok':
-                            result_data["time"] = time.time() - start
-                            result_data["raw"] = resp_data
-                            
-                            # Extract progress info for monitoring
-                            if 'result' in resp_data and 'stdout' in resp_data.get('result', {}):
-                                result_data["progress_info"] = self.monitor_delfi_progress(resp_data['result']['stdout'])
-                            
-                            if 'result' in resp_data:
-                                res = resp_data['result']
-                                plan = self.extract_plan(res, planner, domain)
-                                
-                                if plan and len(plan) > 0:
-                                    result_data["solved"] = True
-                                    result_data["plan"] = plan
-                                    result_data["plan_length"] = len(plan)
-                                    print(f"\n✓ SOLVED! Found plan with {len(plan)} actions in {result_data['time']:.1f}s")
-                                    
-                                    # Save successful result to main results directory
-                                    filename = f"{domain}_{planner}_{problem.replace('.pddl', '')}.json"
-                                    filepath = os.path.join(self.results_dir, filename)
-                                    with open(filepath, 'w') as f:
-                                        json.dump(result_data, f, indent=2)
-                                    
-                                    return result_data
-                                else:
-                                    # No plan found yet - show progress
-                                    if time.time() - last_progress > 30:
-                                        elapsed = time.time() - start
-                                        progress_msg = f"\n  Still running... ({elapsed:.0f}s elapsed"
-                                        
-                                        # Add progress info
-                                        progress_info = result_data.get("progress_info", {})
-                                        if 'evaluated' in progress_info:
-                                            progress_msg += f", {progress_info['evaluated']} states evaluated"
-                                        if 'current_f' in progress_info:
-                                            progress_msg += f", f={progress_info['current_f']}"
-                                        
-                                        print(progress_msg + ")", end='', flush=True)
-                                        last_progress = time.time()
-                                        
-                                        # Only save debug if state changed significantly
-                                        if (planner == "delfi" and 
-                                            debug_save_count < max_debug_saves and
-                                            self.should_save_debug(planner, domain, problem, progress_info)):
-                                            self._save_minimal_debug_info(domain, planner, problem, start, progress_info)
-                                            debug_save_count += 1
-                                    
-                        elif 'status' in resp_data and resp_data['status'] in ['error', 'failed']:
-                            result_data["error"] = "Planning failed"
-                            result_data["time"] = time.time() - start
-                            print(f"\n✗ FAILED: Planning error after {result_data['time']:.1f}s")
-                            
-                            # Save failed result to debug directory
-                            self._save_failed_result(domain, planner, problem, result_data)
-                            return result_data
-                    
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    time.sleep(0.5)
-            
-            # Timeout - save minimal debug info
-            result_data["error"] = "Extended timeout reached"
-            result_data["time"] = time.time() - start
-            
-            self._save_timeout_debug(domain, planner, problem, timeout, result_data, poll_responses[-10:], result_url)
-            
-            print(f"\n✗ TIMEOUT: No solution found within {timeout}s")
-            if planner == "delfi" and result_data.get("progress_info"):
-                info = result_data["progress_info"]
-                if 'initialization_time' in info:
-                    print(f"   Delfi initialization took: {info['initialization_time']:.1f}s")
-                if 'evaluated' in info:
-                    print(f"   States evaluated before timeout: {info['evaluated']}")
+        exp = {
+            "planner": planner,
+            "domain": domain,
+            "problem": problem,
+            "timeout": timeout,
+            "url": url,
+            "payload": payload,
+            "result_data": result_data
+        }
+        return None, exp
+    
+    def _start_polling(self, exp, response):
+        """Handle the solve response; returns a failed result or None to start polling"""
+        planner, domain, problem = exp['planner'], exp['domain'], exp['problem']
+        result_data = exp['result_data']
+        
+        if response.status_code != 200:
+            result_data["error"] = f"HTTP {response.status_code}"
+            result_data["time"] = time.time() - exp['start']
+            logger.info(f"✗ Request FAILED (HTTP {response.status_code})")
             
-            print(f"   Debug info saved to: {self.debug_dir}/")
+            # Save failed result to debug directory
+            self._save_failed_result(domain, planner, problem, result_data)
+            return result_data
+        
+        initial = response.json()
+        if 'result' not in initial:
+            result_data["error"] = "No result URL"
+            result_data["time"] = time.time() - exp['start']
+            logger.info("✗ Request FAILED (No URL)")
             
+            # Save failed result to debug directory
+            self._save_failed_result(domain, planner, problem, result_data)
             return result_data
+        
+        exp['result_url'] = self.base_url + initial['result']
+        logger.info(f"→ Request accepted, polling for results (timeout: {exp['timeout']}s)...")
+        
+        # Progress is parsed incrementally per experiment; start from scratch
+        exp['progress_key'] = f"{planner}_{domain}_{problem}"
+        self._progress_state.pop(exp['progress_key'], None)
+        
+        # Poll with reduced debug saving
+        exp['last_progress'] = time.time()
+        exp['poll_responses'] = deque(maxlen=10)  # Only the last polls are kept for debugging
+        exp['debug_save_count'] = 0
+        exp['max_debug_saves'] = 5  # Limit total debug saves per experiment
+        exp['poll_interval'] = self.poll_interval_min
+        exp['last_poll_state'] = None
+        return None
+    
+    def _back_off_polling(self, exp):
+        """Double the poll interval, but only once the fast-poll window has passed"""
+        if time.time() - exp['start'] >= self.poll_fast_window:
+            exp['poll_interval'] = min(exp['poll_interval'] * 2, self.poll_interval_max)
+    
+    def _handle_poll(self, exp, resp):
+        """Process one poll response; returns the final result once the run is over"""
+        planner, domain, problem = exp['planner'], exp['domain'], exp['problem']
+        result_data = exp['result_data']
+        start = exp['start']
+        
+        if resp.status_code != 200:
+            return None
+        resp_data = resp.json()
+        
+        # Poll faster again as soon as the planner produces new output
+        poll_state = (resp_data.get('status'), len(str((resp_data.get('result') or {}).get('stdout', ''))))
+        if poll_state != exp['last_poll_state']:
+            exp['poll_interval'] = self.poll_interval_min
+            exp['last_poll_state'] = poll_state
+        
+        # Store response for debugging
+        exp['poll_responses'].append({
+            "time_elapsed": time.time() - start,
+            "status": resp_data.get('status'),
+            "has_result": 'result' in resp_data
+        })
+        
+        if 'status' in resp_data and resp_data['status'] == 'ok':
+            result_data["time"] = time.time() - start
+            result_data["raw"] = resp_data
             
-        except Exception as e:
-            result_data["error"] = str(e)[:100]
+            # Extract progress info for monitoring
+            if 'result' in resp_data and 'stdout' in resp_data.get('result', {}):
+                result_data["progress_info"] = self.monitor_delfi_progress(resp_data['result']['stdout'], exp['progress_key'], final=True)
+            
+            if 'result' in resp_data:
+                res = resp_data['result']
+                plan = self.extract_plan(res, planner, domain)
+                
+                if plan and len(plan) > 0:
+                    result_data["solved"] = True
+                    result_data["plan"] = plan
+                    result_data["plan_length"] = len(plan)
+                    logger.info(f"✓ SOLVED! Found plan with {len(plan)} actions in {result_data['time']:.1f}s")
+                    
+                    # Save successful result to main results directory
+                    filename = self._result_filename(domain, planner, problem)
+                    filepath = os.path.join(self.results_dir, filename)
+                    self._write_json(filepath, result_data)
+                    self._existing_files.add(filename)
+                    self._existing_cache[(domain, planner, problem)] = (True, {"solved": True, "plan_length": len(plan)})
+                    
+                    return result_data
+                else:
+                    # No plan found yet - show progress
+                    if time.time() - exp['last_progress'] > 30:
+                        elapsed = time.time() - start
+                        progress_msg = f"  Still running... ({elapsed:.0f}s elapsed"
+                        
+                        # Add progress info
+                        progress_info = result_data.get("progress_info", {})
+                        if 'evaluated' in progress_info:
+                            progress_msg += f", {progress_info['evaluated']} states evaluated"
+                        if 'current_f' in progress_info:
+                            progress_msg += f", f={progress_info['current_f']}"
+                        
+                        logger.info(progress_msg + ")")
+                        exp['last_progress'] = time.time()
+                        
+                        # Only save debug if state changed significantly
+                        if (planner == "delfi" and 
+                            exp['debug_save_count'] < exp['max_debug_saves'] and
+                            self.should_save_debug(planner, domain, problem, progress_info)):
+                            self._save_minimal_debug_info(domain, planner, problem, start, progress_info)
+                            exp['debug_save_count'] += 1
+                    
+        elif 'status' in resp_data and resp_data['status'] in ['error', 'failed']:
+            result_data["error"] = "Planning failed"
             result_data["time"] = time.time() - start
-            print(f"\n✗ ERROR: {str(e)[:50]}")
+            logger.info(f"✗ FAILED: Planning error after {result_data['time']:.1f}s")
             
-            # Save error result to debug directory
+            # Save failed result to debug directory
             self._save_failed_result(domain, planner, problem, result_data)
             return result_data
+        
+        return None
+    
+    def _finish_timeout(self, exp):
+        """Record a run that hit its extended timeout"""
+        planner, domain, problem, timeout = exp['planner'], exp['domain'], exp['problem'], exp['timeout']
+        result_data = exp['result_data']
+        
+        # Timeout - save minimal debug info
+        result_data["error"] = "Extended timeout reached"
+        result_data["time"] = time.time() - exp['start']
+        
+        self._save_timeout_debug(domain, planner, problem, timeout, result_data, exp['poll_responses'], exp['result_url'])
+        
+        logger.info(f"✗ TIMEOUT: No solution found within {timeout}s")
+        if planner == "delfi" and result_data.get("progress_info"):
+            info = result_data["progress_info"]
+            if 'initialization_time' in info:
+                logger.info(f"   Delfi initialization took: {info['initialization_time']:.1f}s")
+            if 'evaluated' in info:
+                logger.info(f"   States evaluated before timeout: {info['evaluated']}")
+        
+        logger.info(f"   Debug info saved to: {self.debug_dir}/")
+        
+        return result_data
+    
+    def _finish_error(self, exp, e):
+        """Record a run that failed with an exception"""
+        result_data = exp['result_data']
+        result_data["error"] = str(e)[:100]
+        result_data["time"] = time.time() - exp['start']
+        logger.info(f"✗ ERROR: {str(e)[:50]}")
+        
+        # Save error result to debug directory
+        self._save_failed_result(exp['domain'], exp['planner'], exp['problem'], result_data)
+        return result_data
+    
+    def _write_json(self, filepath, data):
+        """Serialize data as indented JSON"""
+        with open(filepath, 'wb') as f:
+            f.write(_json_dumps(data, indent=True))
+    
+    def _enqueue_json(self, filepath, data):
+        """Serialize data now and hand the write to the background writer"""
+        self._write_q.put((filepath, _json_dumps(data, indent=True)))
+    
+    def _writer_loop(self):
+        """Write queued debug files until the process exits"""
+        while True:
+            filepath, payload = self._write_q.get()
+            try:
+                with open(filepath, 'wb') as f:
+                    f.write(payload)
+            except OSError as e:
+                logger.warning(f"✗ Failed to write {filepath}: {e}")
+            finally:
+                self._write_q.task_done()
+    
+    def flush(self):
+        """Block until all queued debug files have been written"""
+        self._write_q.join()
     
     def _save_minimal_debug_info(self, domain, planner, problem, start_time, progress_info):
         """Save minimal debug information"""
@@ -536,17 +919,15 @@ class ImprovedExperimentRunner:
             "progress": progress_info
         }
         
-        filename = f"DEBUG_{domain}_{planner}_{problem.replace('.pddl', '')}_{int(time.time())}.json"
+        filename = f"DEBUG_{domain}_{planner}_{self._stem(problem)}_{int(time.time())}.json"
         filepath = os.path.join(self.debug_dir, filename)
-        with open(filepath, 'w') as f:
-            json.dump(debug_data, f, indent=2)
+        self._enqueue_json(filepath, debug_data)
     
     def _save_failed_result(self, domain, planner, problem, result_data):
         """Save failed result to debug directory"""
-        filename = f"{domain}_{planner}_{problem.replace('.pddl', '')}_FAILED.json"
+        filename = f"{domain}_{planner}_{self._stem(problem)}_FAILED.json"
         filepath = os.path.join(self.debug_dir, filename)
-        with open(filepath, 'w') as f:
-            json.dump(result_data, f, indent=2)
+        self._enqueue_json(filepath, result_data)
     
     def _save_timeout_debug(self, domain, planner, problem, timeout, result_data, last_polls, result_url):
         """Save comprehensive timeout debug information"""
@@ -558,16 +939,15 @@ class ImprovedExperimentRunner:
             "timeout_used": timeout,
             "total_time": result_data["time"],
             "error": "TIMEOUT",
-            "last_poll_responses": last_polls,
+            "last_poll_responses": list(last_polls),
             "result_url": result_url,
             "final_progress": result_data.get("progress_info", {}),
             "notes": f"Planner did not complete within {timeout} seconds"
         }
         
-        filename = f"TIMEOUT_{domain}_{planner}_{problem.replace('.pddl', '')}_{int(time.time())}.json"
+        filename = f"TIMEOUT_{domain}_{planner}_{self._stem(problem)}_{int(time.time())}.json"
         filepath = os.path.join(self.debug_dir, filename)
-        with open(filepath, 'w') as f:
-            json.dump(debug_data, f, indent=2)
+        self._enqueue_json(filepath, debug_data)
     
     def extract_plan(self, result, planner, domain):
         """Extract plan from result"""
@@ -594,20 +974,28 @@ class ImprovedExperimentRunner:
     def _parse_plan_text(self, text, domain, planner):
         """Parse plan text with improved Delfi support"""
         plan = []
-        valid_actions = self.domain_actions.get(domain, [])
+        valid_actions = self._domain_action_sets.get(domain, frozenset())
+        action_alt = self._action_alt.get(domain)
         
         # Check for timeout/signal
         if 'caught signal' in text or 'exiting' in text:
             return []
         
+        # Cheap literal checks first: without any of these markers no parser below can match
+        if ('(' not in text and 'Solution found!' not in text and 'Plan length:' not in text
+                and not _STEP_RE.search(text)):
+            return []
+        
+        # Split once; both the Delfi and the generic parser walk the same lines
+        lines = text.split('\n')
+        
         # Special handling for Delfi/Fast Downward format
         if planner == "delfi":
             # Check if Delfi/Fast Downward found a solution
             if 'Solution found!' in text or 'Plan length:' in text:
-                lines = text.split('\n')
                 in_plan_section = False
                 
-                for i, line in enumerate(lines):
+                for line in lines:
                     # Look for plan section markers
                     if 'Solution found!' in line or 'Plan length:' in line:
                         in_plan_section = True
@@ -620,138 +1008,139 @@ class ImprovedExperimentRunner:
                         continue
                     
                     if in_plan_section:
-                        line = line.strip()
+                        stripped = line.strip()
                         
                         # Skip empty lines and metadata
-                        if not line or line.startswith(';') or ':' in line:
+                        if not stripped or stripped[0] == ';' or ':' in stripped:
                             continue
                         
                         # Check if line looks like an action
-                        if line.startswith('(') and line.endswith(')'):
-                            # Parse the action
-                            action_text = line[1:-1].strip().lower()
-                            action_parts = action_text.split()
+                        if stripped[0] == '(' and stripped[-1] == ')':
+                            # Parse the action (the only place the line is lowercased)
+                            action_text = stripped[1:-1].strip().lower()
+                            action_parts = action_text.split(None, 1)  # Only the action name is needed
                             
                             if action_parts and action_parts[0] in valid_actions:
                                 plan.append(f"({action_text})")
-                        elif any(action in line.lower() for action in valid_actions):
-                            # Try to extract action from line
-                            line_lower = line.lower()
-                            for action in valid_actions:
-                                if action in line_lower:
-                                    # Extract the full action with parameters
-                                    match = re.search(rf'\b{action}\s+[^()]+', line_lower)
-                                    if match:
-                                        action_text = match.group(0).strip()
-                                        plan.append(f"({action_text})")
-                                        break
+                        elif action_alt is not None:
+                            # Try to extract the full action with parameters from the line
+                            match = action_alt.search(stripped)
+                            if match:
+                                action_text = match.group(0).strip().lower()
+                                plan.append(f"({action_text})")
         
         # If no plan found with Delfi format, try generic patterns
         if not plan:
-            patterns = [
-                r'^\s*\(([^)]+)\)\s*$',  # Standard (action param1 param2)
-                r'^\s*[\d.]+:\s*\(([^)]+)\)(?:\s*\[[\d.]+\])?',  # Temporal: 0.000: (action) [duration]
-                r'^\s*\d+:\s*\(([^)]+)\)',  # Numbered: 1: (action)
-                r'^\s*step\s+\d+:\s*([A-Z\-]+(?:\s+[A-Z0-9\-]+)*)',  # Step format
-            ]
-            
-            for line in text.split('\n'):
-                line = line.strip()
-                if not line or line.startswith(';'):
+            for line in lines:
+                stripped = line.strip()
+                if not stripped or stripped[0] == ';':
                     continue
+                
+                match = _GENERIC_PLAN_RE.match(stripped)
+                if match:
+                    action_text = (match.group('act') or match.group('step')).strip().lower()
+                    action_parts = action_text.split(None, 1)  # Only the action name is needed
                     
-                for pattern in patterns:
-                    match = re.match(pattern, line, re.IGNORECASE)
-                    if match:
-                        action_text = match.group(1).strip().lower()
-                        action_parts = action_text.split()
-                        
-                        if action_parts and action_parts[0] in valid_actions:
-                            if not action_text.startswith('('):
-                                action_text = f"({action_text})"
-                            plan.append(action_text)
-                            break
+                    if action_parts and action_parts[0] in valid_actions:
+                        if not action_text.startswith('('):
+                            action_text = f"({action_text})"
+                        plan.append(action_text)
         
         return plan
     
-    def run_all_experiments(self):
-        """Run all experiments (all planners × all problems)"""
-        total_experiments = len(self.planners) * len(self.all_problems)
-        print(f"\nTotal possible experiments: {total_experiments}")
-        print(f"Planners: {', '.join(self.planners)}")
-        print(f"Domains: blocksworld, barman, logistics")
-        print(f"\nSuccessful results will be saved to: {self.results_dir}/")
-        print(f"Debug/failed results will be saved to: {self.debug_dir}/")
+    def plan_todo(self):
+        """Classify every experiment in one pass
         
-        # Count blacklisted experiments
+        Returns (to_run, blacklisted_count, existing_count), where to_run lists
+        (planner, domain, problem, problem_dir) for experiments still to run.
+        Experiments are grouped by problem so each file is read only once.
+        """
+        to_run = []
         blacklisted_count = 0
-        for planner in self.planners:
-            for domain, problem, _ in self.all_problems:
-                if self.is_blacklisted(planner, domain, problem):
-                    blacklisted_count += 1
-        
-        print(f"\nBlacklisted experiments: {blacklisted_count}")
-        
-        # Count existing results
         existing_count = 0
-        to_run = []
-        
-        for planner in self.planners:
-            for domain, problem, problem_dir in self.all_problems:
-                if self.is_blacklisted(planner, domain, problem):
-                    continue
-                    
-                exists, _ = self.check_existing_result(domain, planner, problem)
-                if exists:
+        for domain, problem, problem_dir in self.all_problems:
+            for planner in self.planners:
+                if (planner, domain, problem) in self.blacklist:
+                    blacklisted_count += 1
+                elif self.check_existing_result(domain, planner, problem)[0]:
                     existing_count += 1
                 else:
                     to_run.append((planner, domain, problem, problem_dir))
+        return to_run, blacklisted_count, existing_count
+    
+    def run_all_experiments(self):
+        """Run all experiments (all planners × all problems)"""
+        total_experiments = len(self.planners) * len(self.all_problems)
+        logger.info(f"\nTotal possible experiments: {total_experiments}")
+        logger.info(f"Planners: {', '.join(self.planners)}")
+        logger.info(f"Domains: blocksworld, barman, logistics")
+        logger.info(f"\nSuccessful results will be saved to: {self.results_dir}/")
+        logger.info(f"Debug/failed results will be saved to: {self.debug_dir}/")
+        
+        # Count blacklisted and existing experiments in the same pass that builds to_run
+        to_run, blacklisted_count, existing_count = self.plan_todo()
+        
+        logger.info(f"\nBlacklisted experiments: {blacklisted_count}")
         
-        print(f"Existing successful results: {existing_count}")
-        print(f"Experiments to run: {len(to_run)}")
+        logger.info(f"Existing successful results: {existing_count}")
+        logger.info(f"Experiments to run: {len(to_run)}")
         
         if len(to_run) == 0:
-            print("\n✓ All non-blacklisted experiments completed!")
+            logger.info("\n✓ All non-blacklisted experiments completed!")
             return {"solved": existing_count, "failed": 0, "timeout": 0, "skipped": blacklisted_count}
         
         # Run experiments
         stats = {"solved": 0, "failed": 0, "timeout": 0, "skipped": blacklisted_count}
         
+        # to_run is grouped by problem: read each file once and hand it to every planner
+        loaded_path = problem_content = None
         for i, (planner, domain, problem, problem_dir) in enumerate(to_run, 1):
-            print(f"\n[{i}/{len(to_run)}] {planner} on {domain}/{problem}")
+            logger.info(f"\n[{i}/{len(to_run)}] {planner} on {domain}/{problem}")
             
-            result = self.run_experiment_with_extended_timeout(planner, problem, domain, problem_dir)
+            problem_path = os.path.join(problem_dir, problem)
+            if problem_path != loaded_path:
+                loaded_path = problem_path
+                try:
+                    problem_content = self._load_problem(problem_path)
+                except FileNotFoundError:
+                    problem_content = None  # Reported by the experiment itself
+            
+            started = time.time()
+            result = self.run_experiment_with_extended_timeout(planner, problem, domain, problem_dir, problem_content)
             
             if result.get("skipped", False):
                 # Already counted in blacklisted_count
                 pass
             elif result.get("solved", False):
                 stats["solved"] += 1
-                print(f"   → Saved to: {self.results_dir}/{domain}_{planner}_{problem.replace('.pddl', '')}.json")
+                logger.info(f"   → Saved to: {self.results_dir}/{self._result_filename(domain, planner, problem)}")
             elif "timeout" in str(result.get("error", "")).lower():
                 stats["timeout"] += 1
-                print(f"   → Timeout info saved to: {self.debug_dir}/")
+                logger.info(f"   → Timeout info saved to: {self.debug_dir}/")
             else:
                 stats["failed"] += 1
-                print(f"   → Failed info saved to: {self.debug_dir}/")
+                logger.info(f"   → Failed info saved to: {self.debug_dir}/")
             
-            # Small delay between experiments
-            time.sleep(2)
+            # Keep requests at least 2s apart; no wait after skips or slow runs
+            if not result.get("skipped", False):
+                time.sleep(max(0, 2 - (time.time() - started)))
+        
+        self.flush()
         
         # Print summary
-        print(f"\n\n{'='*70}")
-        print("SUMMARY")
-        print(f"{'='*70}")
-        print(f"Total experiments: {total_experiments}")
-        print(f"Blacklisted: {blacklisted_count}")
-        print(f"Already solved: {existing_count}")
-        print(f"Experiments run: {len(to_run)}")
-        print(f"Newly solved: {stats['solved']}")
-        print(f"Failed: {stats['failed']}")
-        print(f"Timeout: {stats['timeout']}")
-        print(f"Total solved: {existing_count + stats['solved']}")
+        logger.info(f"\n\n{'='*70}")
+        logger.info("SUMMARY")
+        logger.info(f"{'='*70}")
+        logger.info(f"Total experiments: {total_experiments}")
+        logger.info(f"Blacklisted: {blacklisted_count}")
+        logger.info(f"Already solved: {existing_count}")
+        logger.info(f"Experiments run: {len(to_run)}")
+        logger.info(f"Newly solved: {stats['solved']}")
+        logger.info(f"Failed: {stats['failed']}")
+        logger.info(f"Timeout: {stats['timeout']}")
+        logger.info(f"Total solved: {existing_count + stats['solved']}")
         effective_total = total_experiments - blacklisted_count
-        print(f"Success rate: {((existing_count + stats['solved']) / effective_total * 100):.1f}% (excluding blacklisted)")
+        logger.info(f"Success rate: {((existing_count + stats['solved']) / effective_total * 100):.1f}% (excluding blacklisted)")
         
         # Save summary
         summary = {
@@ -767,36 +1156,117 @@ class ImprovedExperimentRunner:
             "domains": ["blocksworld", "barman", "logistics"],
             "results_directory": self.results_dir,
             "debug_directory": self.debug_dir,
-            "blacklist": self.blacklist
+            "blacklist": self.blacklist_list
         }
         
-        with open(os.path.join(self.debug_dir, "run_summary.json"), 'w') as f:
-            json.dump(summary, f, indent=2)
+        self._write_json(os.path.join(self.debug_dir, "run_summary.json"), summary)
+        
+        logger.info(f"\nSuccessful results saved to: {os.path.abspath(self.results_dir)}/")
+        logger.info(f"Debug/failed results saved to: {os.path.abspath(self.debug_dir)}/")
+        
+        return stats
+    
+    def run_all(self, max_workers=8):
+        """Run all missing experiments concurrently (polling is I/O-bound)"""
+        to_run, _, _ = self.plan_todo()
+        
+        logger.info(f"\nExperiments to run: {len(to_run)} ({max_workers} workers)")
+        stats = {"solved": 0, "failed": 0, "timeout": 0}
         
-        print(f"\nSuccessful results saved to: {os.path.abspath(self.results_dir)}/")
-        print(f"Debug/failed results saved to: {os.path.abspath(self.debug_dir)}/")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.run_experiment_with_extended_timeout, planner, problem, domain, problem_dir): (planner, domain, problem)
+                for planner, domain, problem, problem_dir in to_run
+            }
+            
+            for i, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                planner, domain, problem = futures[future]
+                self._count_result(stats, future.result())
+                logger.info(f"\n[{i}/{len(to_run)}] Finished {planner} on {domain}/{problem}")
         
+        self.flush()
+        logger.info(f"\nNewly solved: {stats['solved']}, Failed: {stats['failed']}, Timeout: {stats['timeout']}")
         return stats
+    
+    async def run_all_async(self, max_concurrency=8, max_per_planner=None):
+        """Run all missing experiments on one event loop sharing one HTTP client
+        
+        The client speaks HTTP/2 when the h2 package is installed and falls back
+        to HTTP/1.1 otherwise.
+        
+        max_concurrency bounds the experiments in flight overall; max_per_planner
+        optionally bounds them per planner so one solver backend is not flooded.
+        """
+        if httpx is None:
+            raise RuntimeError("run_all_async requires httpx (pip install 'httpx[http2]')")
+        
+        to_run, _, _ = self.plan_todo()
+        logger.info(f"\nExperiments to run: {len(to_run)} (up to {max_concurrency} concurrent)")
+        stats = {"solved": 0, "failed": 0, "timeout": 0}
+        semaphore = asyncio.Semaphore(max_concurrency)
+        planner_limits = {p: asyncio.Semaphore(max_per_planner) for p in self.planners} if max_per_planner else {}
+        finished = 0
+        
+        # httpx raises ImportError for http2=True without h2, so only ask for it when available
+        http2 = importlib.util.find_spec("h2") is not None
+        async with httpx.AsyncClient(http2=http2, verify=False, timeout=60) as client:
+            async def run_one(planner, domain, problem, problem_dir):
+                nonlocal finished
+                # Take the planner slot first so waiting never holds a global slot
+                async with planner_limits.get(planner, contextlib.nullcontext()):
+                    async with semaphore:
+                        result = await self.run_experiment_async(planner, problem, domain, problem_dir, client)
+                self._count_result(stats, result)
+                finished += 1
+                logger.info(f"\n[{finished}/{len(to_run)}] Finished {planner} on {domain}/{problem}")
+            
+            await asyncio.gather(*(run_one(*experiment) for experiment in to_run))
+        
+        self.flush()
+        logger.info(f"\nNewly solved: {stats['solved']}, Failed: {stats['failed']}, Timeout: {stats['timeout']}")
+        return stats
+    
+    def _count_result(self, stats, result):
+        """Add one experiment outcome to solved/failed/timeout counters"""
+        if result.get("solved", False):
+            stats["solved"] += 1
+        elif "timeout" in str(result.get("error", "")).lower():
+            stats["timeout"] += 1
+        else:
+            stats["failed"] += 1
 
 def main():
+    # Runner progress goes through the logger and reaches the console in batches
+    handler = BufferedConsoleHandler()
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    
     print("IMPROVED COMPREHENSIVE EXPERIMENT RUNNER v2")
     print("With blacklist support and reduced debug file generation")
     print("="*70)
     
     runner = ImprovedExperimentRunner()
+    handler.flush()
     
     print("\nOptions:")
     print("1. Run all missing experiments")
-    print("2. Show status only")
-    print("3. Show blacklisted experiments")
-    print("4. Exit")
+    print("2. Run all missing experiments in parallel")
+    print("3. Run all missing experiments asynchronously (requires httpx)")
+    print("4. Show status only")
+    print("5. Show blacklisted experiments")
+    print("6. Exit")
     
-    choice = input("\nChoice (1-4): ").strip()
+    choice = input("\nChoice (1-6): ").strip()
     
     if choice == "1":
         runner.run_all_experiments()
     elif choice == "2":
-        # Just show status
+        runner.run_all()
+    elif choice == "3":
+        asyncio.run(runner.run_all_async())
+    elif choice == "4":
+        # Just show status; one directory scan, then in-memory lookups
+        runner.refresh_existing_index()
         existing_count = 0
         missing_count = 0
         blacklisted_count = 0
@@ -829,12 +1299,14 @@ def main():
             rate = (stats["solved"] / effective_total * 100) if effective_total > 0 else 0
             print(f"  {planner}: {stats['solved']}/{effective_total} ({rate:.1f}%) [{stats['blacklisted']} blacklisted]")
     
-    elif choice == "3":
+    elif choice == "5":
         # Show blacklisted experiments
         print("\nBlacklisted experiments:")
-        for planner, domain, problem in runner.blacklist:
+        for planner, domain, problem in runner.blacklist_list:
             print(f"  - {planner} on {domain}/{problem}")
-        print(f"\nTotal: {len(runner.blacklist)} experiments")
+        print(f"\nTotal: {len(runner.blacklist_list)} experiments")
+    
+    handler.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file